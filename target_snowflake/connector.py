@@ -1,10 +1,13 @@
 from __future__ import annotations
 
+import copy
+import json
 import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum
-from functools import cached_property
+from functools import cache, cached_property, lru_cache
 from pathlib import Path
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, ClassVar
 
 import snowflake.sqlalchemy.custom_types as sct
 import sqlalchemy
@@ -15,6 +18,7 @@ from singer_sdk.connectors.sql import FullyQualifiedName, JSONSchemaToSQL
 from singer_sdk.exceptions import ConfigValidationError
 from snowflake.sqlalchemy import URL
 from snowflake.sqlalchemy.base import SnowflakeIdentifierPreparer
+from snowflake.sqlalchemy.parser.custom_type_parser import parse_type
 from snowflake.sqlalchemy.snowdialect import SnowflakeDialect
 from sqlalchemy.sql import text
 
@@ -26,6 +30,111 @@ if TYPE_CHECKING:
     from sqlalchemy.engine import Engine
 
 
+# Quoting identifiers only needs the dialect's rules, so share one preparer.
+_DIALECT = SnowflakeDialect()
+_FORMATTER = SnowflakeIdentifierPreparer(_DIALECT)
+# SHOW commands return at most this many rows.
+_SHOW_MAX_ROWS = 10000
+
+_MERGE_FROM_STAGE_TEMPLATE = (
+    "merge into {full_table_name} d using "
+    "(select {json_casting_selects} from {stage_location}"
+    "(file_format => {file_format}) {dedup}) s "
+    "on {join_expr} "
+    "when matched then update set {matched_clause} "
+    "when not matched then insert ({not_matched_insert_cols}) "
+    "values ({not_matched_insert_values})"
+)
+
+
+@cache
+def _get_target_type(reflected_type: type) -> type | None:
+    """Return the target type class for a reflected column type class, if it has one.
+
+    Reflected types are often dialect subclasses (e.g. NUMBER reflects as a DECIMAL
+    subclass), so this checks subclasses once per class instead of on every column.
+    """
+    for source_type, target_type in (
+        (sct.TIMESTAMP_NTZ, TIMESTAMP_NTZ),
+        (sct.NUMBER, NUMBER),
+        (sct.VARIANT, VARIANT),
+    ):
+        if issubclass(reflected_type, source_type):
+            return target_type
+    return None
+
+
+@lru_cache(maxsize=8)
+def _convert_private_key_to_der(key_content: bytes, passphrase: bytes | None) -> bytes:
+    """Decrypt a PEM private key and return it as unencrypted PKCS8 DER.
+
+    Parsing the key is CPU heavy, so each key is only converted once per process.
+    """
+    p_key = serialization.load_pem_private_key(
+        key_content,
+        password=passphrase,
+        backend=default_backend(),
+    )
+
+    return p_key.private_bytes(
+        encoding=serialization.Encoding.DER,
+        format=serialization.PrivateFormat.PKCS8,
+        encryption_algorithm=serialization.NoEncryption(),
+    )
+
+
+def _get_information_schema_type(
+    data_type: str,
+    numeric_precision: int | None,
+    numeric_scale: int | None,
+    character_maximum_length: int | None,
+) -> sqlalchemy.types.TypeEngine:
+    """Parse an information_schema column type the way DESC TABLE reports it."""
+    if data_type == "NUMBER":
+        return parse_type(f"NUMBER({numeric_precision},{numeric_scale})")
+    if data_type == "TEXT" and character_maximum_length:
+        return parse_type(f"VARCHAR({character_maximum_length})")
+    if data_type == "BINARY" and character_maximum_length:
+        return parse_type(f"BINARY({character_maximum_length})")
+    return parse_type(data_type)
+
+
+def _get_show_columns_type(data_type: str) -> tuple[sqlalchemy.types.TypeEngine, bool]:
+    """Parse the JSON `data_type` of a SHOW COLUMNS row into a type and nullability."""
+    info = json.loads(data_type)
+    type_name = info["type"]
+    if type_name == "FIXED":
+        sql_type = parse_type(f"NUMBER({info['precision']},{info['scale']})")
+    elif type_name in {"TEXT", "BINARY"}:
+        sql_type = parse_type(f"{'VARCHAR' if type_name == 'TEXT' else 'BINARY'}({info['length']})")
+    elif type_name == "REAL":
+        sql_type = parse_type("FLOAT")
+    else:
+        sql_type = parse_type(type_name)
+    return sql_type, info.get("nullable", True)
+
+
+def _resolve_identifier(identifier: str) -> str:
+    """Return the name Snowflake resolves an identifier to in this target's sessions.
+
+    The session sets QUOTED_IDENTIFIERS_IGNORE_CASE, so quoted identifiers resolve
+    to upper case just like unquoted ones.
+    """
+    if len(identifier) > 1 and identifier.startswith('"') and identifier.endswith('"'):
+        # The quotes are not part of the name.
+        identifier = identifier[1:-1].replace('""', '"')
+    return identifier.upper()
+
+
+def _freeze_jsonschema(value: Any) -> Any:  # noqa: ANN401
+    """Return a hashable representation of a JSON schema value."""
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze_jsonschema(item)) for key, item in value.items()))
+    if isinstance(value, list):
+        return tuple(_freeze_jsonschema(item) for item in value)
+    return value
+
+
 class SnowflakeFullyQualifiedName(FullyQualifiedName):
     def __init__(
         self,
@@ -34,7 +143,7 @@ class SnowflakeFullyQualifiedName(FullyQualifiedName):
         schema: str | None = None,
         database: str | None = None,
         delimiter: str = ".",
-        dialect: SnowflakeDialect,
+        dialect: SnowflakeDialect = _DIALECT,
     ) -> None:
         self.dialect = dialect
         super().__init__(table=table, schema=schema, database=database, delimiter=delimiter)
@@ -64,10 +173,26 @@ class SnowflakeConnector(SQLConnector):
     allow_temp_tables: bool = True  # Whether temp tables are supported.
 
     max_varchar_length = 16_777_216
+    put_parallelism = 8  # Number of threads a single PUT uses to upload a file.
+    put_concurrency = 4  # Default number of files uploaded to the stage at the same time.
+    file_format_name = "TARGET_SNOWFLAKE_JSON"  # Shared by every load into a schema.
+    identifier_preparer = _FORMATTER  # Quotes identifiers without creating an engine.
+    # Databases already checked for access in this process, by account, user and role.
+    verified_databases: ClassVar[set[tuple]] = set()
 
     def __init__(self, *args: Any, **kwargs: Any) -> None:
         self.table_cache: dict = {}
-        self.schema_cache: dict = {}
+        self.schema_cache: set[str] = set()
+        self.sql_type_cache: dict = {}
+        self.file_format_cache: set = set()
+        self.merge_clause_cache: dict = {}
+        self.column_selection_cache: dict = {}
+        self.fully_qualified_name_cache: dict = {}
+        # (database, schema) keys whose tables were loaded into `table_cache` at once.
+        self._schemas_preloaded: set[tuple] = set()
+        # Column changes collected while `prepare_table` runs, see `_apply_column_changes`.
+        self._pending_column_adds: list[sqlalchemy.Column] | None = None
+        self._pending_column_alters: list[tuple[str, sqlalchemy.types.TypeEngine]] | None = None
         super().__init__(*args, **kwargs)
 
     def get_table_columns(
@@ -84,36 +209,119 @@ class SnowflakeConnector(SQLConnector):
         Returns:
             An ordered list of column objects.
         """
-        if full_table_name in self.table_cache:
-            return self.table_cache[full_table_name]
-        _, schema_name, table_name = self.parse_full_table_name(full_table_name)
-        inspector = sqlalchemy.inspect(self._engine)
-        columns = inspector.get_columns(table_name, schema_name)
-
-        parsed_columns = {
-            col_meta["name"]: sqlalchemy.Column(
-                col_meta["name"],
-                self._convert_type(col_meta["type"]),
-                nullable=col_meta.get("nullable", False),
+        cache_key = self._get_table_cache_key(full_table_name)
+        self._preload_schema_columns(cache_key)
+        if cache_key not in self.table_cache:
+            # Not in the preloaded schema, e.g. created or altered since then.
+            self.table_cache[cache_key] = self._describe_table_columns(full_table_name)
+        table_columns = self.table_cache[cache_key]
+        if table_columns is None:
+            raise sqlalchemy.exc.NoSuchTableError(full_table_name)
+        if not column_names:
+            return table_columns
+        # The cache always holds every column, so filtering happens on the way out.
+        wanted = {col.casefold() for col in column_names}
+        return {name: column for name, column in table_columns.items() if name.casefold() in wanted}
+
+    def _describe_table_columns(self, full_table_name: str) -> dict[str, sqlalchemy.Column] | None:
+        """Return every column of a table, or None if the table does not exist.
+
+        DESC TABLE describes only this table, while `Inspector.get_columns` queries
+        information_schema for every column in the schema.
+        """
+        try:
+            with self._connect() as conn:
+                rows = conn.execute(text(f"desc table {full_table_name} type = columns")).fetchall()
+        except sqlalchemy.exc.ProgrammingError:
+            return None
+        columns = {}
+        for row in rows:
+            name = _DIALECT.normalize_name(row[0])
+            columns[name] = sqlalchemy.Column(
+                name,
+                self._convert_type(parse_type(row[1])),
+                nullable=row[3] == "Y",
             )
-            for col_meta in columns
-            if not column_names or col_meta["name"].casefold() in {col.casefold() for col in column_names}
-        }
-        self.table_cache[full_table_name] = parsed_columns
-        return parsed_columns
+        return columns
 
-    @staticmethod
-    def _convert_type(sql_type):  # noqa: ANN205, ANN001
-        if isinstance(sql_type, sct.TIMESTAMP_NTZ):
-            return TIMESTAMP_NTZ
+    def _get_table_cache_key(self, full_table_name: str | FullyQualifiedName) -> tuple:
+        """Return the same `table_cache` key for every spelling of a table name.
 
-        if isinstance(sql_type, sct.NUMBER):
-            return NUMBER
+        The session sets QUOTED_IDENTIFIERS_IGNORE_CASE, so Snowflake resolves quoted
+        identifiers to upper case just like unquoted ones: `"my_table"`, `my_table`
+        and `MY_TABLE` all name the table stored as MY_TABLE, and share its key.
+        """
+        return tuple(part and _resolve_identifier(part) for part in self.parse_full_table_name(full_table_name))
 
-        if isinstance(sql_type, sct.VARIANT):
-            return VARIANT
+    def _preload_schema_columns(self, cache_key: tuple) -> None:
+        """Load the columns of every table in a schema into `table_cache`.
 
-        return sql_type
+        One schema-wide listing replaces a DESC TABLE round trip for each stream
+        that writes to the schema. Tables missing from the result are left out of
+        the cache, so they are still looked up individually.
+
+        Args:
+            cache_key: A `table_cache` key of a table in the schema.
+        """
+        database, schema_name, _ = cache_key
+        if not database or not schema_name or (database, schema_name) in self._schemas_preloaded:
+            return
+        self._schemas_preloaded.add((database, schema_name))
+        with self._connect() as conn:
+            # SHOW is answered by the metadata service, while a SELECT on
+            # information_schema resumes the warehouse and is billed for it.
+            try:
+                rows = conn.execute(
+                    text(f"show columns in schema {_FORMATTER.quote(database)}.{_FORMATTER.quote(schema_name)}"),
+                ).fetchall()
+            except sqlalchemy.exc.ProgrammingError:
+                # The schema does not exist yet.
+                return
+            columns = [(row[0], row[2], *_get_show_columns_type(row[3])) for row in rows]
+            if len(rows) >= _SHOW_MAX_ROWS:
+                # SHOW output is truncated, so fall back to information_schema.
+                # The database is an identifier and cannot be bound, so it is quoted
+                # instead; the filter values are bound.
+                rows = conn.execute(
+                    text(
+                        "select table_name, column_name, data_type, is_nullable, numeric_precision, "  # noqa: S608
+                        "numeric_scale, character_maximum_length "
+                        f"from {_FORMATTER.quote(database)}.information_schema.columns "
+                        "where table_catalog = :database and table_schema = :schema_name "
+                        "order by table_name, ordinal_position",
+                    ),
+                    {"database": database, "schema_name": schema_name},
+                ).fetchall()
+                columns = [
+                    (row[0], row[1], _get_information_schema_type(row[2], row[4], row[5], row[6]), row[3] == "YES")
+                    for row in rows
+                ]
+
+        tables: dict[str, dict[str, sqlalchemy.Column]] = {}
+        for table_name, column_name, sql_type, nullable in columns:
+            name = _DIALECT.normalize_name(column_name)
+            tables.setdefault(table_name, {})[name] = sqlalchemy.Column(
+                name,
+                self._convert_type(sql_type),
+                nullable=nullable,
+            )
+        for table_name, table_columns in tables.items():
+            self.table_cache.setdefault((database, schema_name, table_name), table_columns)
+
+    def table_exists(self, full_table_name: str | FullyQualifiedName) -> bool:
+        cache_key = self._get_table_cache_key(full_table_name)
+        self._preload_schema_columns(cache_key)
+        if cache_key in self.table_cache:
+            return self.table_cache[cache_key] is not None
+        return super().table_exists(full_table_name)
+
+    def create_empty_table(self, full_table_name: str | FullyQualifiedName, *args: Any, **kwargs: Any) -> None:
+        super().create_empty_table(full_table_name, *args, **kwargs)
+        self.table_cache.pop(self._get_table_cache_key(full_table_name), None)
+
+    @staticmethod
+    def _convert_type(sql_type):  # noqa: ANN205, ANN001
+        return _get_target_type(type(sql_type)) or sql_type
 
     def get_private_key(self):
         """Get private key from the right location."""
@@ -125,17 +333,14 @@ class SnowflakeConnector(SQLConnector):
         else:
             key_content = self.config["private_key"].encode()
 
-        p_key = serialization.load_pem_private_key(
-            key_content,
-            password=encoded_passphrase,
-            backend=default_backend(),
-        )
+        return _convert_private_key_to_der(key_content, encoded_passphrase)
 
-        return p_key.private_bytes(
-            encoding=serialization.Encoding.DER,
-            format=serialization.PrivateFormat.PKCS8,
-            encryption_algorithm=serialization.NoEncryption(),
-        )
+    @property
+    def put_max_concurrency(self) -> int:
+        """Return the number of files uploaded to the stage at the same time."""
+        # The setting is nullable, but the schema rejects values below one.
+        concurrency = self.config.get("put_max_concurrency")
+        return self.put_concurrency if concurrency is None else concurrency
 
     @cached_property
     def auth_method(self) -> SnowflakeAuthMethod:
@@ -144,7 +349,7 @@ class SnowflakeConnector(SQLConnector):
             return SnowflakeAuthMethod.BROWSER
 
         valid_auth_methods = {"private_key", "private_key_path", "password"}
-        config_auth_methods = [x for x in self.config if x in valid_auth_methods]
+        config_auth_methods = valid_auth_methods & self.config.keys()
         if len(config_auth_methods) != 1:
             msg = (
                 "Neither password nor private key was provided for "
@@ -152,9 +357,9 @@ class SnowflakeConnector(SQLConnector):
                 "set use_browser_authentication config option to True."
             )
             raise ConfigValidationError(msg)
-        if config_auth_methods[0] in ["private_key", "private_key_path"]:
-            return SnowflakeAuthMethod.KEY_PAIR
-        return SnowflakeAuthMethod.PASSWORD
+        if "password" in config_auth_methods:
+            return SnowflakeAuthMethod.PASSWORD
+        return SnowflakeAuthMethod.KEY_PAIR
 
     def get_sqlalchemy_url(self, config: dict) -> str:
         """Generates a SQLAlchemy URL for Snowflake.
@@ -168,14 +373,15 @@ class SnowflakeConnector(SQLConnector):
             "database": config["database"],
         }
 
-        if self.auth_method == SnowflakeAuthMethod.BROWSER:
+        auth_method = self.auth_method
+        if auth_method == SnowflakeAuthMethod.BROWSER:
             params["authenticator"] = "externalbrowser"
-        elif self.auth_method == SnowflakeAuthMethod.PASSWORD:
+        elif auth_method == SnowflakeAuthMethod.PASSWORD:
             params["password"] = urllib.parse.quote(config["password"])
 
-        for option in ["warehouse", "role"]:
-            if config.get(option):
-                params[option] = config.get(option)
+        for option in ("warehouse", "role"):
+            if value := config.get(option):
+                params[option] = value
 
         return URL(**params)
 
@@ -205,25 +411,148 @@ class SnowflakeConnector(SQLConnector):
             self.sqlalchemy_url,
             connect_args=connect_args,
             echo=False,
+            # Sinks share this engine, so keep enough authenticated sessions around for
+            # concurrent work, including one per concurrent PUT, and recycle them well
+            # before Snowflake expires them.
+            pool_size=max(8, self.put_max_concurrency),
+            max_overflow=16,
+            pool_recycle=3600,
+            pool_pre_ping=False,
         )
-        with engine.connect() as conn:
-            db_names = [db[1] for db in conn.execute(text("SHOW DATABASES;")).fetchall()]
-            if self.config["database"] not in db_names:
-                msg = f"Database '{self.config['database']}' does not exist or the user/role doesn't have access to it."
+        database = self.config["database"]
+        access_key = (self.config["account"], self.config["user"], self.config.get("role"), database)
+        if access_key not in self.verified_databases:
+            # A raw cursor is enough to read one column of a handful of rows.
+            raw_connection = engine.raw_connection()
+            try:
+                cursor = raw_connection.cursor()
+                cursor.execute("SHOW TERSE DATABASES LIKE %(database)s", {"database": database})
+                # LIKE is case insensitive and treats _ as a wildcard, so compare the names exactly.
+                db_names = [db[1] for db in cursor.fetchall()]
+            finally:
+                raw_connection.close()
+            if database not in db_names:
+                msg = f"Database '{database}' does not exist or the user/role doesn't have access to it."
                 raise Exception(msg)  # noqa: TRY002
+            self.verified_databases.add(access_key)
         return engine
 
+    def prepare_table(
+        self,
+        full_table_name: str | FullyQualifiedName,
+        schema: dict,
+        primary_keys: Sequence[str],
+        partition_keys: list[str] | None = None,
+        as_temp_table: bool = False,  # noqa: FBT001, FBT002
+    ) -> None:
+        """Adapt target table to provided schema if possible.
+
+        New columns and column type changes are collected while the schema is
+        walked, then applied with one ALTER TABLE statement each.
+
+        Args:
+            full_table_name: the target table name.
+            schema: the JSON Schema for the table.
+            primary_keys: list of key properties.
+            partition_keys: list of partition keys.
+            as_temp_table: True to create a temp table.
+        """
+        self._pending_column_adds = []
+        self._pending_column_alters = []
+        try:
+            super().prepare_table(
+                full_table_name,
+                schema,
+                primary_keys,
+                partition_keys=partition_keys,
+                as_temp_table=as_temp_table,
+            )
+            self._apply_column_changes(
+                full_table_name,
+                self._pending_column_adds,
+                self._pending_column_alters,
+            )
+        finally:
+            self._pending_column_adds = None
+            self._pending_column_alters = None
+
+    def _apply_column_changes(
+        self,
+        full_table_name: str | FullyQualifiedName,
+        columns_to_add: list[sqlalchemy.Column],
+        columns_to_alter: list[tuple[str, sqlalchemy.types.TypeEngine]],
+    ) -> None:
+        """Add and alter columns of a table with a single statement for each.
+
+        The statements join the clauses from `get_column_add_clause` and
+        `get_column_alter_clause`, the same ones `get_column_add_ddl` and
+        `get_column_alter_ddl` use for a single column.
+        """
+        statements = []
+        if columns_to_add:
+            add_clauses = ", ".join(self.get_column_add_clause(column.name, column.type) for column in columns_to_add)
+            statements.append(
+                sqlalchemy.DDL(
+                    "ALTER TABLE %(table_name)s ADD COLUMN %(add_clauses)s",
+                    {"table_name": full_table_name, "add_clauses": add_clauses},
+                ),
+            )
+        if columns_to_alter:
+            alter_clauses = ", ".join(
+                self.get_column_alter_clause(column_name, column_type) for column_name, column_type in columns_to_alter
+            )
+            statements.append(
+                sqlalchemy.DDL(
+                    "ALTER TABLE %(table_name)s ALTER %(alter_clauses)s",
+                    {"table_name": full_table_name, "alter_clauses": alter_clauses},
+                ),
+            )
+        if not statements:
+            return
+
+        try:
+            with self._connect() as conn, conn.begin():
+                for statement in statements:
+                    conn.execute(statement)
+        except Exception:
+            self.logger.exception(
+                "Error adapting columns of '%s', adding %s and altering %s",
+                full_table_name,
+                [column.name for column in columns_to_add],
+                [column_name for column_name, _ in columns_to_alter],
+            )
+            raise
+        finally:
+            # The cached columns no longer match the table.
+            self.table_cache.pop(self._get_table_cache_key(full_table_name), None)
+
+    def _create_empty_column(
+        self,
+        full_table_name: str | FullyQualifiedName,
+        column_name: str,
+        sql_type: sqlalchemy.types.TypeEngine,
+    ) -> None:
+        if not self.allow_column_add:
+            msg = "Adding columns is not supported."
+            raise NotImplementedError(msg)
+
+        column = sqlalchemy.Column(column_name, sql_type)
+        if self._pending_column_adds is not None:
+            # Applied together with the other column changes by `prepare_table`.
+            self._pending_column_adds.append(column)
+            return
+        self._apply_column_changes(full_table_name, [column], [])
+
     def prepare_column(
         self,
         full_table_name: str,
         column_name: str,
         sql_type: sqlalchemy.types.TypeEngine,
     ) -> None:
-        formatter = SnowflakeIdentifierPreparer(SnowflakeDialect())
         # Make quoted column names upper case because we create them that way
         # and the metadata that SQLAlchemy returns is case insensitive only for non-quoted
         # column names so these will look like they dont exist yet.
-        if '"' in formatter.format_collation(column_name):
+        if '"' in _FORMATTER.format_collation(column_name):
             column_name = column_name.upper()
 
         try:
@@ -246,17 +575,77 @@ class SnowflakeConnector(SQLConnector):
         column_name: str,
         new_column_name: str,
     ) -> sqlalchemy.DDL:
-        formatter = SnowflakeIdentifierPreparer(SnowflakeDialect())
         # Since we build the ddl manually we can't rely on SQLAlchemy to
         # quote column names automatically.
         return SQLConnector.get_column_rename_ddl(
             table_name,
-            formatter.format_collation(column_name),
-            formatter.format_collation(new_column_name),
+            _FORMATTER.format_collation(column_name),
+            _FORMATTER.format_collation(new_column_name),
         )
 
     @staticmethod
+    def get_column_add_clause(
+        column_name: str,
+        column_type: sqlalchemy.types.TypeEngine,
+    ) -> str:
+        """Get the clause that defines a new column in an `ADD COLUMN` statement.
+
+        Args:
+            column_name: Column name to create.
+            column_type: New column sqlalchemy type.
+
+        Returns:
+            The column definition, for example `name VARCHAR(10)`.
+        """
+        return (
+            sqlalchemy.schema.CreateColumn(sqlalchemy.Column(column_name, column_type)).compile(dialect=_DIALECT).string
+        )
+
+    def get_column_add_ddl(
+        self,
+        table_name: str | FullyQualifiedName,
+        column_name: str,
+        column_type: sqlalchemy.types.TypeEngine,
+    ) -> sqlalchemy.DDL:
+        """Get the create column DDL statement.
+
+        Args:
+            table_name: Fully qualified table name of column to alter.
+            column_name: Column name to create.
+            column_type: New column sqlalchemy type.
+
+        Returns:
+            A sqlalchemy DDL instance.
+        """
+        return sqlalchemy.DDL(
+            "ALTER TABLE %(table_name)s ADD COLUMN %(create_column_clause)s",
+            {
+                "table_name": table_name,
+                "create_column_clause": self.get_column_add_clause(column_name, column_type),
+            },
+        )
+
+    @staticmethod
+    def get_column_alter_clause(
+        column_name: str,
+        column_type: sqlalchemy.types.TypeEngine,
+    ) -> str:
+        """Get the clause that changes the type of a column in an `ALTER` statement.
+
+        Args:
+            column_name: Column name to alter.
+            column_type: New column type string.
+
+        Returns:
+            The clause, for example `COLUMN name SET DATA TYPE VARCHAR(20)`.
+        """
+        # Since we build the ddl manually we can't rely on SQLAlchemy to
+        # quote column names automatically.
+        return f"COLUMN {_FORMATTER.format_collation(column_name)} SET DATA TYPE {column_type}"
+
+    @classmethod
     def get_column_alter_ddl(
+        cls,
         table_name: str,
         column_name: str,
         column_type: sqlalchemy.types.TypeEngine,
@@ -273,15 +662,11 @@ class SnowflakeConnector(SQLConnector):
         Returns:
             A sqlalchemy DDL instance.
         """
-        formatter = SnowflakeIdentifierPreparer(SnowflakeDialect())
-        # Since we build the ddl manually we can't rely on SQLAlchemy to
-        # quote column names automatically.
         return sqlalchemy.DDL(
-            "ALTER TABLE %(table_name)s ALTER COLUMN %(column_name)s SET DATA TYPE %(column_type)s",
+            "ALTER TABLE %(table_name)s ALTER %(alter_column_clause)s",
             {
                 "table_name": table_name,
-                "column_name": formatter.format_collation(column_name),
-                "column_type": column_type,
+                "alter_column_clause": cls.get_column_alter_clause(column_name, column_type),
             },
         )
 
@@ -296,24 +681,77 @@ class SnowflakeConnector(SQLConnector):
         to_sql.register_format_handler("date-time", TIMESTAMP_NTZ)
         return to_sql
 
-    def schema_exists(self, schema_name: str) -> bool:
-        if schema_name in self.schema_cache:
-            return True
-        schema_names = sqlalchemy.inspect(self._engine).get_schema_names()
-        self.schema_cache = schema_names
-        formatter = SnowflakeIdentifierPreparer(SnowflakeDialect())
+    def to_sql_type(self, jsonschema_type: dict) -> sqlalchemy.types.TypeEngine:
+        """Return the SQL type for a JSON schema, reusing previous conversions.
+
+        Every batch converts each property of the stream schema again, so the result
+        is cached by the content of the JSON schema.
+
+        Args:
+            jsonschema_type: The JSON Schema representation of the source type.
+
+        Returns:
+            The SQLAlchemy type representation of the data type.
+        """
+        key = _freeze_jsonschema(jsonschema_type)
+        if key not in self.sql_type_cache:
+            self.sql_type_cache[key] = super().to_sql_type(jsonschema_type)
+        # Callers such as `update_collation` change types in place, so hand out a copy.
+        return copy.copy(self.sql_type_cache[key])
+
+    @staticmethod
+    def _get_schema_cache_key(schema_name: str) -> str:
         # Make quoted schema names upper case because we create them that way
         # and the metadata that SQLAlchemy returns is case insensitive only for
         # non-quoted schema names so these will look like they dont exist yet.
-        if '"' in formatter.format_collation(schema_name):
-            schema_name = schema_name.upper()
-        return schema_name in schema_names
+        if '"' in _FORMATTER.format_collation(schema_name):
+            return schema_name.upper()
+        return schema_name
+
+    def schema_exists(self, schema_name: str) -> bool:
+        # The database always has INFORMATION_SCHEMA, so an empty cache means the
+        # schema names have not been loaded yet.
+        if not self.schema_cache:
+            # Read the names straight off a connector cursor, like the dialect's
+            # `get_schema_names` but without building an Inspector and result rows.
+            with self._connect() as conn:
+                cursor = conn.connection.cursor()
+                try:
+                    cursor.execute("show terse schemas")
+                    self.schema_cache = {_DIALECT.normalize_name(row[1]) for row in cursor.fetchall()}
+                finally:
+                    cursor.close()
+        return self._get_schema_cache_key(schema_name) in self.schema_cache
+
+    def create_schema(self, schema_name: str) -> None:
+        super().create_schema(schema_name)
+        if self.schema_cache:
+            self.schema_cache.add(self._get_schema_cache_key(schema_name))
 
     # Custom SQL get methods
 
-    def _get_put_statement(self, sync_id: str, file_uri: str) -> tuple[text, dict]:  # noqa: ARG002
-        """Get Snowflake PUT statement."""
-        return (text(f"put :file_uri '@~/target-snowflake/{sync_id}'"), {})
+    @staticmethod
+    def _get_stage_location(sync_id: str, suffix: str = "") -> str:
+        """Get the quoted user stage location for the files of a sync.
+
+        The sync ID starts with the stream name, so it is escaped for use in a
+        string literal.
+        """
+        location = f"@~/target-snowflake/{sync_id}{suffix}"
+        return "'" + location.replace("\\", "\\\\").replace("'", "\\'") + "'"
+
+    def _get_put_statement(self, sync_id: str, file_uri: str) -> tuple[str, dict]:
+        """Get Snowflake PUT statement.
+
+        The statement is run on a raw connector cursor, so `file_uri` is bound with
+        the connector's pyformat style and literal percent signs are escaped.
+        """
+        options = f"parallel = {self.put_parallelism}"
+        if file_uri.endswith(".gz"):
+            # Batch files are already gzipped, so skip client-side compression detection.
+            options += " auto_compress = false source_compression = gzip"
+        stage_location = self._get_stage_location(sync_id).replace("%", "%%")
+        return (f"put %(file_uri)s {stage_location} {options}", {})
 
     @staticmethod
     def _format_column_selections(column_selections: list, format: str) -> str:  # noqa: A002
@@ -350,6 +788,55 @@ class SnowflakeConnector(SQLConnector):
             )
         return column_selections
 
+    def _get_column_selection_clauses(self, schema: dict) -> tuple[list, str, str]:
+        """Get the column selections of a schema, its JSON casting select list and column list.
+
+        Cached by schema, and shared by the COPY and MERGE statements.
+        """
+        cache_key = (tuple(schema["properties"]), _freeze_jsonschema(schema["properties"]))
+        if cache_key not in self.column_selection_cache:
+            column_selections = self._get_column_selections(schema, _FORMATTER)
+            self.column_selection_cache[cache_key] = (
+                column_selections,
+                self._format_column_selections(column_selections, "json_casting"),
+                self._format_column_selections(column_selections, "col_alias"),
+            )
+        return self.column_selection_cache[cache_key]
+
+    def _get_merge_clauses(self, schema: dict, key_properties: Iterable[str]) -> dict[str, str]:
+        """Get the column lists of a MERGE statement, cached by schema and keys."""
+        key_properties = tuple(key_properties)
+        # Settings such as `dedup_in_merge` are fixed for a connector and its cache, so
+        # they are not part of the key.
+        cache_key = (tuple(schema["properties"]), _freeze_jsonschema(schema["properties"]), key_properties)
+        if cache_key in self.merge_clause_cache:
+            return self.merge_clause_cache[cache_key]
+
+        column_selections, json_casting_selects, _ = self._get_column_selection_clauses(schema)
+
+        # use UPPER from here onwards, matching the aliases of the casting selects
+        aliases = dict(zip(schema["properties"], (col["clean_alias"] for col in column_selections)))
+        formatted_properties = list(aliases.values())
+        formatted_key_properties = [aliases.get(col) or _FORMATTER.format_collation(col) for col in key_properties]
+        join_expr = " and ".join(f"d.{key} = s.{key}" for key in formatted_key_properties)
+        matched_clause = ", ".join(f"d.{col} = s.{col}" for col in formatted_properties)
+        not_matched_insert_cols = ", ".join(formatted_properties)
+        not_matched_insert_values = ", ".join(f"s.{col}" for col in formatted_properties)
+        dedup = ""
+        if self.config.get("dedup_in_merge", True):
+            dedup_cols = ", ".join(formatted_key_properties)
+            dedup = f"QUALIFY ROW_NUMBER() OVER (PARTITION BY {dedup_cols} ORDER BY SEQ8() DESC) = 1"
+        clauses = {
+            "json_casting_selects": json_casting_selects,
+            "dedup": dedup,
+            "join_expr": join_expr,
+            "matched_clause": matched_clause,
+            "not_matched_insert_cols": not_matched_insert_cols,
+            "not_matched_insert_values": not_matched_insert_values,
+        }
+        self.merge_clause_cache[cache_key] = clauses
+        return clauses
+
     def _get_merge_from_stage_statement(  # noqa: ANN202
         self,
         full_table_name: str,
@@ -359,67 +846,62 @@ class SnowflakeConnector(SQLConnector):
         key_properties: Iterable[str],
     ):
         """Get Snowflake MERGE statement."""
-        formatter = SnowflakeIdentifierPreparer(SnowflakeDialect())
-        column_selections = self._get_column_selections(schema, formatter)
-        json_casting_selects = self._format_column_selections(
-            column_selections,
-            "json_casting",
-        )
-
-        # use UPPER from here onwards
-        formatted_properties = [formatter.format_collation(col) for col in schema["properties"]]
-        formatted_key_properties = [formatter.format_collation(col) for col in key_properties]
-        join_expr = " and ".join(
-            [f"d.{key} = s.{key}" for key in formatted_key_properties],
-        )
-        matched_clause = ", ".join(
-            [f"d.{col} = s.{col}" for col in formatted_properties],
-        )
-        not_matched_insert_cols = ", ".join(formatted_properties)
-        not_matched_insert_values = ", ".join(
-            [f"s.{col}" for col in formatted_properties],
-        )
-        dedup_cols = ", ".join(list(formatted_key_properties))
-        dedup = f"QUALIFY ROW_NUMBER() OVER (PARTITION BY {dedup_cols} ORDER BY SEQ8() DESC) = 1"
-        return (
-            text(
-                f"merge into {full_table_name} d using "  # noqa: ISC003, S608
-                + f"(select {json_casting_selects} from '@~/target-snowflake/{sync_id}'"  # noqa: S608
-                + f"(file_format => {file_format}) {dedup}) s "
-                + f"on {join_expr} "
-                + f"when matched then update set {matched_clause} "
-                + f"when not matched then insert ({not_matched_insert_cols}) "
-                + f"values ({not_matched_insert_values})",
-            ),
-            {},
+        merge_statement = _MERGE_FROM_STAGE_TEMPLATE.format_map(
+            {
+                **self._get_merge_clauses(schema, key_properties),
+                "full_table_name": full_table_name,
+                "stage_location": self._get_stage_location(sync_id),
+                "file_format": file_format,
+            },
         )
+        return (text(merge_statement), {})
 
     def _get_copy_statement(self, full_table_name, schema, sync_id, file_format):  # noqa: ANN202, ANN001
         """Get Snowflake COPY statement."""
-        formatter = SnowflakeIdentifierPreparer(SnowflakeDialect())
-        column_selections = self._get_column_selections(schema, formatter)
-        json_casting_selects = self._format_column_selections(
-            column_selections,
-            "json_casting",
-        )
-        col_alias_selects = self._format_column_selections(
-            column_selections,
-            "col_alias",
-        )
+        if self.config.get("copy_match_by_column_name"):
+            # Let Snowflake map the JSON keys onto the table columns itself.
+            return (
+                text(
+                    f"copy into {full_table_name} from {self._get_stage_location(sync_id)} "
+                    f"file_format = (format_name='{file_format}') "
+                    "match_by_column_name = case_insensitive purge = true",
+                ),
+                {},
+            )
+        column_selections, json_casting_selects, col_alias_selects = self._get_column_selection_clauses(schema)
+        if self.config.get("compact_copy_sql") and self._columns_match_table(full_table_name, column_selections):
+            # The select list follows the table's column order, so Snowflake can load
+            # it positionally and the column list only adds SQL to parse.
+            col_alias_selects = ""
         return (
             text(
-                f"copy into {full_table_name} {col_alias_selects} from "  # noqa: ISC003, S608
-                + f"(select {json_casting_selects} from "  # noqa: S608
-                + f"'@~/target-snowflake/{sync_id}')"
-                + f"file_format = (format_name='{file_format}')",
+                f"copy into {full_table_name} {col_alias_selects} from "  # noqa: S608
+                f"(select {json_casting_selects} from "
+                f"{self._get_stage_location(sync_id)})"
+                f"file_format = (format_name='{file_format}') "
+                "purge = true",
             ),
             {},
         )
 
+    def _columns_match_table(self, full_table_name: str, column_selections: list) -> bool:
+        """Return whether a table has exactly the selected columns, in the same order.
+
+        Columns added by schema evolution go to the end of the table, and tables
+        created elsewhere may order their columns differently, so a positional COPY
+        is only safe after this check.
+        """
+        try:
+            table_columns = self.get_table_columns(full_table_name)
+        except sqlalchemy.exc.NoSuchTableError:
+            return False
+        selected_names = [_resolve_identifier(col["clean_alias"]) for col in column_selections]
+        return [name.upper() for name in table_columns] == selected_names
+
     def _get_file_format_statement(self, file_format):  # noqa: ANN202, ANN001
         """Get Snowflake CREATE FILE FORMAT statement."""
         return (
-            text(f"create or replace file format {file_format}type = 'JSON' compression = 'AUTO'"),
+            text(f"create file format if not exists {file_format} type = 'JSON' compression = 'AUTO'"),
             {},
         )
 
@@ -433,7 +915,7 @@ class SnowflakeConnector(SQLConnector):
     def _get_stage_files_remove_statement(self, sync_id):  # noqa: ANN202, ANN001
         """Get Snowflake REMOVE statement."""
         return (
-            text(f"remove '@~/target-snowflake/{sync_id}/'"),
+            text(f"remove {self._get_stage_location(sync_id, '/')}"),
             {},
         )
 
@@ -446,15 +928,49 @@ class SnowflakeConnector(SQLConnector):
             sync_id: The sync ID for the batch.
             files: The files containing records to upload.
         """
+        if len(files) == 1:
+            # Most batches stage a single file, which needs no worker threads.
+            self._put_file_to_stage(sync_id, files[0])
+            return
+        # Each PUT blocks on network I/O outside the GIL, so upload files concurrently,
+        # each on its own pooled connection.
+        with ThreadPoolExecutor(max_workers=self.put_max_concurrency) as executor:
+            for _ in executor.map(lambda file_uri: self._put_file_to_stage(sync_id, file_uri), files):
+                pass
+
+    def _put_file_to_stage(self, sync_id: str, file_uri: str) -> None:
+        put_statement, kwargs = self._get_put_statement(
+            sync_id=sync_id,
+            file_uri=file_uri,
+        )
         with self._connect() as conn, conn.begin():
-            for file_uri in files:
-                put_statement, kwargs = self._get_put_statement(
-                    sync_id=sync_id,
-                    file_uri=file_uri,
-                )
+            cursor = conn.connection.cursor()
+            try:
                 # sqlalchemy.text stripped a slash, which caused windows to fail so we used bound parameters instead
                 # See https://github.com/MeltanoLabs/target-snowflake/issues/87 for more information about this error
-                conn.execute(put_statement, {"file_uri": file_uri, **kwargs})
+                cursor.execute(put_statement, {"file_uri": file_uri, **kwargs})
+            finally:
+                cursor.close()
+
+    def _execute_raw(self, statement: text) -> int:
+        """Run a statement without parameters on a raw connector cursor.
+
+        Stage operations take no bind parameters, so this skips SQLAlchemy's
+        statement compilation.
+
+        Args:
+            statement: The statement to run.
+
+        Returns:
+            The number of rows affected.
+        """
+        with self._connect() as conn, conn.begin():
+            cursor = conn.connection.cursor()
+            try:
+                cursor.execute(str(statement))
+                return cursor.rowcount
+            finally:
+                cursor.close()
 
     def create_file_format(self, file_format: str) -> None:
         """Create a file format in the schema.
@@ -462,15 +978,15 @@ class SnowflakeConnector(SQLConnector):
         Args:
             file_format: The name of the file format.
         """
-        with self._connect() as conn, conn.begin():
-            file_format_statement, kwargs = self._get_file_format_statement(
-                file_format=file_format,
-            )
-            self.logger.debug(
-                "Creating file format with SQL: %s",
-                file_format_statement,
-            )
-            conn.execute(file_format_statement, **kwargs)
+        file_format_statement, _ = self._get_file_format_statement(
+            file_format=file_format,
+        )
+        self.logger.debug(
+            "Creating file format with SQL: %s",
+            file_format_statement,
+        )
+        self._execute_raw(file_format_statement)
+        self.file_format_cache.add(file_format)
 
     def merge_from_stage(
         self,
@@ -479,25 +995,30 @@ class SnowflakeConnector(SQLConnector):
         sync_id: str,
         file_format: str,
         key_properties: Sequence[str],
-    ):
+    ) -> int:
         """Merge data from a stage into a table.
 
+        `load_from_stage` runs the same statement as part of a single request.
+
         Args:
-            sync_id: The sync ID for the batch.
+            full_table_name: The fully-qualified name of the table.
             schema: The schema of the data.
+            sync_id: The sync ID for the batch.
+            file_format: The name of the file format.
             key_properties: The primary key properties of the data.
+
+        Returns:
+            The number of rows merged.
         """
-        with self._connect() as conn, conn.begin():
-            merge_statement, kwargs = self._get_merge_from_stage_statement(
-                full_table_name=full_table_name,
-                schema=schema,
-                sync_id=sync_id,
-                file_format=file_format,
-                key_properties=key_properties,
-            )
-            self.logger.debug("Merging with SQL: %s", merge_statement)
-            result = conn.execute(merge_statement, **kwargs)
-            return result.rowcount
+        merge_statement, _ = self._get_merge_from_stage_statement(
+            full_table_name=full_table_name,
+            schema=schema,
+            sync_id=sync_id,
+            file_format=file_format,
+            key_properties=key_properties,
+        )
+        self.logger.debug("Merging with SQL: %s", merge_statement)
+        return self._execute_raw(merge_statement)
 
     def copy_from_stage(
         self,
@@ -505,25 +1026,28 @@ class SnowflakeConnector(SQLConnector):
         schema: dict,
         sync_id: str,
         file_format: str,
-    ):
+    ) -> int:
         """Copy data from a stage into a table.
 
+        `load_from_stage` runs the same statement as part of a single request.
+
         Args:
             full_table_name: The fully-qualified name of the table.
             schema: The schema of the data.
             sync_id: The sync ID for the batch.
             file_format: The name of the file format.
+
+        Returns:
+            The number of rows copied.
         """
-        with self._connect() as conn, conn.begin():
-            copy_statement, kwargs = self._get_copy_statement(
-                full_table_name=full_table_name,
-                schema=schema,
-                sync_id=sync_id,
-                file_format=file_format,
-            )
-            self.logger.debug("Copying with SQL: %s", copy_statement)
-            result = conn.execute(copy_statement, **kwargs)
-            return result.rowcount
+        copy_statement, _ = self._get_copy_statement(
+            full_table_name=full_table_name,
+            schema=schema,
+            sync_id=sync_id,
+            file_format=file_format,
+        )
+        self.logger.debug("Copying with SQL: %s", copy_statement)
+        return self._execute_raw(copy_statement)
 
     def drop_file_format(self, file_format: str) -> None:
         """Drop a file format in the schema.
@@ -531,12 +1055,12 @@ class SnowflakeConnector(SQLConnector):
         Args:
             file_format: The name of the file format.
         """
-        with self._connect() as conn, conn.begin():
-            drop_statement, kwargs = self._get_drop_file_format_statement(
-                file_format=file_format,
-            )
-            self.logger.debug("Dropping file format with SQL: %s", drop_statement)
-            conn.execute(drop_statement, **kwargs)
+        drop_statement, _ = self._get_drop_file_format_statement(
+            file_format=file_format,
+        )
+        self.logger.debug("Dropping file format with SQL: %s", drop_statement)
+        self._execute_raw(drop_statement)
+        self.file_format_cache.discard(file_format)
 
     def remove_staged_files(self, sync_id: str) -> None:
         """Remove staged files.
@@ -544,12 +1068,72 @@ class SnowflakeConnector(SQLConnector):
         Args:
             sync_id: The sync ID for the batch.
         """
-        with self._connect() as conn, conn.begin():
-            remove_statement, kwargs = self._get_stage_files_remove_statement(
+        remove_statement, _ = self._get_stage_files_remove_statement(
+            sync_id=sync_id,
+        )
+        self.logger.debug("Removing staged files with SQL: %s", remove_statement)
+        self._execute_raw(remove_statement)
+
+    def load_from_stage(
+        self,
+        full_table_name: str,
+        schema: dict,
+        sync_id: str,
+        file_format: str,
+        key_properties: Sequence[str] | None = None,
+    ) -> int:
+        """Load staged files into a table in a single multi-statement request.
+
+        Creates the file format the first time it is used, then merges (or copies
+        when there are no key properties) the staged files into the table. COPY
+        purges the files it loaded itself, so only a MERGE is followed by an
+        explicit REMOVE. Snowflake skips the remaining statements when one fails,
+        so callers should clean up with `remove_staged_files` on error.
+
+        Args:
+            full_table_name: The fully-qualified name of the table.
+            schema: The schema of the data.
+            sync_id: The sync ID for the batch.
+            file_format: The name of the file format.
+            key_properties: The primary key properties of the data.
+
+        Returns:
+            The number of rows loaded.
+        """
+        if key_properties:
+            load_statement, _ = self._get_merge_from_stage_statement(
+                full_table_name=full_table_name,
+                schema=schema,
                 sync_id=sync_id,
+                file_format=file_format,
+                key_properties=key_properties,
             )
-            self.logger.debug("Removing staged files with SQL: %s", remove_statement)
-            conn.execute(remove_statement, **kwargs)
+        else:
+            load_statement, _ = self._get_copy_statement(
+                full_table_name=full_table_name,
+                schema=schema,
+                sync_id=sync_id,
+                file_format=file_format,
+            )
+        create_file_format = file_format not in self.file_format_cache
+        statements = [load_statement]
+        if create_file_format:
+            statements.insert(0, self._get_file_format_statement(file_format=file_format)[0])
+        if key_properties:
+            statements.append(self._get_stage_files_remove_statement(sync_id=sync_id)[0])
+        sql = ";\n".join(str(statement) for statement in statements)
+        self.logger.debug("Loading from stage with SQL: %s", sql)
+        with self._connect() as conn, conn.begin():
+            cursor = conn.connection.cursor()
+            try:
+                cursor.execute(sql, num_statements=len(statements))
+                if create_file_format:
+                    # The cursor starts on the file format result, move to the load.
+                    cursor.nextset()
+                    self.file_format_cache.add(file_format)
+                return cursor.rowcount
+            finally:
+                cursor.close()
 
     @staticmethod
     def get_initialize_script(role, user, password, warehouse, database) -> str:  # noqa: ANN001
@@ -600,6 +1184,65 @@ class SnowflakeConnector(SQLConnector):
 
         """
 
+    @staticmethod
+    def _type_equal(
+        first: sqlalchemy.types.TypeEngine,
+        second: sqlalchemy.types.TypeEngine,
+    ) -> bool:
+        """Return whether two SQL types render the same, without compiling them if possible."""
+        if type(first) is type(second):
+            if isinstance(first, sqlalchemy.types.String):
+                return first.length == second.length and first.collation == second.collation
+            if isinstance(first, sqlalchemy.types.Numeric):
+                return first.precision == second.precision and first.scale == second.scale
+        return str(first) == str(second)
+
+    def _get_compatible_column_type(
+        self,
+        full_table_name: str,
+        column_name: str,
+        sql_type: sqlalchemy.types.TypeEngine,
+    ) -> sqlalchemy.types.TypeEngine | None:
+        """Return the type a column must be altered to, or None if it can stay as is.
+
+        This mirrors the comparison steps of `SQLConnector._adapt_column_type` in
+        singer-sdk, comparing with `_type_equal` instead of rendering both types, and
+        must be kept in step with the SDK version this target pins.
+
+        Raises:
+            NotImplementedError: if the column needs altering but that is not supported.
+        """
+        # Copied because `table_cache` holds the column type and its collation is removed below.
+        current_type: sqlalchemy.types.TypeEngine = copy.copy(
+            self._get_column_type(
+                full_table_name,
+                column_name,
+            ),
+        )
+        # remove collation if present and save it
+        current_type_collation = self.remove_collation(current_type)
+        if self._type_equal(sql_type, current_type):
+            return None
+
+        compatible_sql_type = self.merge_sql_types([current_type, sql_type])
+        if self._type_equal(compatible_sql_type, current_type):
+            return None
+
+        # Put the collation level back before altering the column
+        if current_type_collation:
+            # `merge_sql_types` may return one of its inputs, so collate a copy.
+            compatible_sql_type = copy.copy(compatible_sql_type)
+            self.update_collation(compatible_sql_type, current_type_collation)
+
+        if not self.allow_column_alter:
+            msg = (
+                "Altering columns is not supported. Could not convert column "
+                f"'{full_table_name}.{column_name}' from '{current_type}' to "
+                f"'{compatible_sql_type}'."
+            )
+            raise NotImplementedError(msg)
+        return compatible_sql_type
+
     def _adapt_column_type(
         self,
         full_table_name: str,
@@ -617,9 +1260,16 @@ class SnowflakeConnector(SQLConnector):
             NotImplementedError: if altering columns is not supported.
         """
         try:
-            super()._adapt_column_type(full_table_name, column_name, sql_type)
+            compatible_sql_type = self._get_compatible_column_type(full_table_name, column_name, sql_type)
+            if compatible_sql_type is None:
+                return
+            if self._pending_column_alters is not None:
+                # Applied together with the other column changes by `prepare_table`.
+                self._pending_column_alters.append((column_name, compatible_sql_type))
+                return
+            self._apply_column_changes(full_table_name, [], [(column_name, compatible_sql_type)])
         except Exception:
-            current_type: sqlalchemy.types.TypeEngine = self._get_column_type(
+            current_type = self._get_column_type(
                 full_table_name,
                 column_name,
             )
@@ -639,10 +1289,13 @@ class SnowflakeConnector(SQLConnector):
         db_name: str | None = None,
         delimiter: str = ".",
     ) -> SnowflakeFullyQualifiedName:
-        return SnowflakeFullyQualifiedName(
-            table=table_name,
-            schema=schema_name,
-            database=db_name,
-            delimiter=delimiter,
-            dialect=self._dialect,
-        )
+        # Sinks ask for their table name several times per batch.
+        cache_key = (table_name, schema_name, db_name, delimiter)
+        if cache_key not in self.fully_qualified_name_cache:
+            self.fully_qualified_name_cache[cache_key] = SnowflakeFullyQualifiedName(
+                table=table_name,
+                schema=schema_name,
+                database=db_name,
+                delimiter=delimiter,
+            )
+        return self.fully_qualified_name_cache[cache_key]
@@ -3,7 +3,6 @@ from __future__ import annotations
 import sys
 
 import click
-from sqlalchemy import text
 
 from target_snowflake.connector import SnowflakeConnector
 
@@ -75,12 +74,17 @@ def initializer():
                 click.echo(f"{script}")
                 click.prompt("Confirm?", default=True, type=bool)
                 click.echo("Initialization Started...")
-                for statement in script.split(";"):
-                    if len(statement.strip()) > 0:
-                        conn.execute(
-                            text(statement),
-                        )
-                        click.echo("Success!")
+                # Send the whole script as one multi-statement request. Zero accepts
+                # any number of statements, as splitting on ";" would also split
+                # literals such as the password.
+                cursor = conn.connection.cursor()
+                try:
+                    cursor.execute(script, num_statements=0)
+                    while cursor.nextset():
+                        pass
+                finally:
+                    cursor.close()
+                click.echo("Success!")
             click.echo("Initialization Complete")
         except Exception as e:  # noqa: BLE001
             click.echo(f"Initialization Failed: {e}")
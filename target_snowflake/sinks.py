@@ -2,12 +2,14 @@
 
 from __future__ import annotations
 
-import os
+import shutil
+import tempfile
 import typing as t
+from functools import cached_property
+from pathlib import Path
 from urllib.parse import urlparse
 from uuid import uuid4
 
-from singer_sdk.batch import JSONLinesBatcher
 from singer_sdk.helpers._batch import (
     BaseBatchFileEncoding,
     BatchConfig,
@@ -15,9 +17,8 @@ from singer_sdk.helpers._batch import (
 )
 from singer_sdk.helpers._typing import conform_record_data_types
 from singer_sdk.sinks import SQLSink
-from snowflake.sqlalchemy.base import SnowflakeIdentifierPreparer
-from snowflake.sqlalchemy.snowdialect import SnowflakeDialect
 
+from target_snowflake.batching import JSONLinesBatcher, rechunk_batch_files
 from target_snowflake.connector import SnowflakeConnector
 
 if t.TYPE_CHECKING:
@@ -66,6 +67,14 @@ class SnowflakeSink(SQLSink[SnowflakeConnector]):
     def table_name(self) -> str:
         return super().table_name.upper()
 
+    @cached_property
+    def conformed_schema(self) -> dict:
+        """Return the stream schema with conformed property names.
+
+        A schema change creates a new sink, so this is computed once per sink.
+        """
+        return self.conform_schema(self.schema)
+
     def setup(self) -> None:
         """Set up Sink.
 
@@ -80,7 +89,7 @@ class SnowflakeSink(SQLSink[SnowflakeConnector]):
         try:
             self.connector.prepare_table(
                 full_table_name=self.full_table_name,
-                schema=self.conform_schema(self.schema),
+                schema=self.conformed_schema,
                 primary_keys=self.key_properties,
                 as_temp_table=False,
             )
@@ -89,7 +98,7 @@ class SnowflakeSink(SQLSink[SnowflakeConnector]):
                 self.logger.exception(
                     "Error creating %s %s",
                     self.full_table_name,
-                    self.conform_schema(self.schema),
+                    self.conformed_schema,
                 ),
             )
             raise
@@ -101,8 +110,7 @@ class SnowflakeSink(SQLSink[SnowflakeConnector]):
     ) -> str:
         if object_type and object_type != "column":
             return super().conform_name(name=name, object_type=object_type)
-        formatter = SnowflakeIdentifierPreparer(SnowflakeDialect())
-        if '"' not in formatter.format_collation(name.lower()):
+        if '"' not in self.connector.identifier_preparer.format_collation(name.lower()):
             name = name.lower()
         return name
 
@@ -139,19 +147,38 @@ class SnowflakeSink(SQLSink[SnowflakeConnector]):
             for rcd in records
         )
 
+        clean_up = self.config.get("clean_up_batch_files")
+        batch_config = self.batch_config
+        batch_dir = None
+        if clean_up and "batch_config" not in self.config:
+            # Write to a private directory so the batch files can be removed in one go.
+            batch_dir = tempfile.mkdtemp(prefix="target-snowflake-")
+            batch_config = BatchConfig.from_dict(
+                {**DEFAULT_BATCH_CONFIG, "storage": {"root": Path(batch_dir).as_uri()}},
+            )
+
         # serialize to batch files and upload
         # TODO: support other batchers
         batcher = JSONLinesBatcher(
             tap_name=self.target.name,
             stream_name=self.stream_name,
-            batch_config=self.batch_config,
+            batch_config=batch_config,
         )
         batches = batcher.get_batches(records=processed_records)
-        for files in batches:
-            self.insert_batch_files_via_internal_stage(
-                full_table_name=full_table_name,
-                files=files,
-            )
+        try:
+            for files in batches:
+                try:
+                    self.insert_batch_files_via_internal_stage(
+                        full_table_name=full_table_name,
+                        files=files,
+                    )
+                finally:
+                    # Remove each batch as soon as it is loaded so they do not pile up.
+                    if clean_up:
+                        self._remove_batch_files(files)
+        finally:
+            if batch_dir is not None:
+                shutil.rmtree(batch_dir, ignore_errors=True)
         # if records list, we can quickly return record count.
         return len(records) if isinstance(records, list) else None
 
@@ -179,46 +206,44 @@ class SnowflakeSink(SQLSink[SnowflakeConnector]):
             files: The batch files to process.
         """
         self.logger.info("Processing batch of files.")
+        staging_dir = tempfile.mkdtemp(prefix="target-snowflake-")
         try:
             sync_id = f"{self.stream_name}-{uuid4()}"
-            file_format = f'{self.database_name}.{self.schema_name}."{sync_id}"'
-            self.connector.put_batches_to_stage(sync_id=sync_id, files=files)
+            file_format = f"{self.database_name}.{self.schema_name}.{self.connector.file_format_name}"
+            self.connector.put_batches_to_stage(
+                sync_id=sync_id,
+                files=rechunk_batch_files(files, output_dir=staging_dir),
+            )
             self.connector.prepare_schema(
                 self.conform_name(self.schema_name, object_type="schema"),  # type: ignore[arg-type]
             )
-            self.connector.create_file_format(file_format=file_format)
-
-            if self.key_properties:
-                # merge into destination table
-                record_count = self.connector.merge_from_stage(
-                    full_table_name=full_table_name,
-                    schema=self.schema,
-                    sync_id=sync_id,
-                    file_format=file_format,
-                    key_properties=self.key_properties,
-                )
-
-            else:
-                record_count = self.connector.copy_from_stage(
-                    full_table_name=full_table_name,
-                    schema=self.schema,
-                    sync_id=sync_id,
-                    file_format=file_format,
-                )
-
+            record_count = self.connector.load_from_stage(
+                full_table_name=full_table_name,
+                schema=self.schema,
+                sync_id=sync_id,
+                file_format=file_format,
+                key_properties=self.key_properties,
+            )
+        except Exception:
+            # The load request stops at the first failing statement, so the staged
+            # files may still exist.
+            try:
+                self.connector.remove_staged_files(sync_id=sync_id)
+            except Exception:
+                self.logger.exception("Failed to remove staged files for %s", sync_id)
+            raise
         finally:
             self.logger.debug("Cleaning up after batch processing")
-            self.connector.drop_file_format(file_format=file_format)
-            self.connector.remove_staged_files(sync_id=sync_id)
-            # clean up local files
-            if self.config.get("clean_up_batch_files"):
-                for file_url in files:
-                    file_path = urlparse(file_url).path
-                    if os.path.exists(file_path):  # noqa: PTH110
-                        os.remove(file_path)  # noqa: PTH107
+            shutil.rmtree(staging_dir, ignore_errors=True)
 
         return record_count
 
+    @staticmethod
+    def _remove_batch_files(files: t.Sequence[str]) -> None:
+        """Remove local batch files."""
+        for file_url in files:
+            Path(urlparse(file_url).path).unlink(missing_ok=True)
+
     def process_batch_files(
         self,
         encoding: BaseBatchFileEncoding,
@@ -234,10 +259,14 @@ class SnowflakeSink(SQLSink[SnowflakeConnector]):
             NotImplementedError: If the batch file encoding is not supported.
         """
         if encoding.format == BatchFileFormat.JSONL:
-            record_count = self.insert_batch_files_via_internal_stage(
-                full_table_name=self.full_table_name,
-                files=files,
-            )
+            try:
+                record_count = self.insert_batch_files_via_internal_stage(
+                    full_table_name=self.full_table_name,
+                    files=files,
+                )
+            finally:
+                if self.config.get("clean_up_batch_files"):
+                    self._remove_batch_files(files)
         else:
             msg = f"Unsupported batch file encoding: {encoding.format}"
             raise NotImplementedError(
@@ -94,6 +94,43 @@ class TargetSnowflake(SQLTarget):
             default=True,
             description="Whether to remove batch files after processing.",
         ),
+        th.Property(
+            "compact_copy_sql",
+            th.BooleanType,
+            default=False,
+            description=(
+                "Whether append-only loads should omit the target column list from COPY "
+                "statements when the table's columns match the stream schema in name and "
+                "order. Tables that differ, for example after new columns were added, keep "
+                "the column list."
+            ),
+        ),
+        th.Property(
+            "copy_match_by_column_name",
+            th.BooleanType,
+            default=False,
+            description=(
+                "Whether append-only loads should let Snowflake match JSON keys to table "
+                "columns by name (`MATCH_BY_COLUMN_NAME = CASE_INSENSITIVE`) instead of "
+                "selecting and casting each column."
+            ),
+        ),
+        th.Property(
+            "dedup_in_merge",
+            th.BooleanType,
+            default=True,
+            description=(
+                "Whether upserts should keep only the last staged record per key "
+                "before merging. Disable only when the source guarantees unique keys "
+                "within a batch."
+            ),
+        ),
+        th.Property(
+            "put_max_concurrency",
+            th.IntegerType(minimum=1),
+            default=4,
+            description="The number of batch files uploaded to the Snowflake stage at the same time.",
+        ),
         th.Property(
             "use_browser_authentication",
             th.BooleanType,
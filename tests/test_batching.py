@@ -0,0 +1,215 @@
+"""Tests for batch file preparation."""
+
+from __future__ import annotations
+
+import datetime as dt
+import decimal
+import gzip
+import json
+import os
+import uuid
+from pathlib import Path
+from urllib.parse import urlparse
+
+import pytest
+from singer_sdk._singerlib.json import serialize_json
+
+from target_snowflake import batching
+
+
+@pytest.fixture
+def small_thresholds(monkeypatch: pytest.MonkeyPatch) -> None:
+    # zlib only hands output to the file in blocks, so a shard can overshoot the
+    # target by a few kilobytes; keep the thresholds well above that.
+    monkeypatch.setattr(batching, "MIN_STAGE_FILE_SIZE", 20_000)
+    monkeypatch.setattr(batching, "TARGET_STAGE_FILE_SIZE", 100_000)
+    monkeypatch.setattr(batching, "MAX_STAGE_FILE_SIZE", 200_000)
+    monkeypatch.setattr(batching, "COPY_BUFFER_SIZE", 64)
+
+
+def _write_batch_file(path: Path, lines: list[bytes], *, trailing_newline: bool = True) -> str:
+    content = b"\n".join(lines)
+    if trailing_newline:
+        content += b"\n"
+    with gzip.open(path, "wb", compresslevel=0) as f:
+        f.write(content)
+    return path.as_uri()
+
+
+def _make_lines(file_id: int, count: int) -> list[bytes]:
+    # Random padding keeps the compressed size close to the raw size.
+    return [f'{{"file":{file_id},"line":{i},"pad":"{os.urandom(32).hex()}"}}'.encode() for i in range(count)]
+
+
+def _read_lines(file_uri: str) -> list[bytes]:
+    with gzip.open(urlparse(file_uri).path, "rb") as f:
+        return f.read().splitlines()
+
+
+def _size(file_uri: str) -> int:
+    return Path(urlparse(file_uri).path).stat().st_size
+
+
+@pytest.mark.usefixtures("small_thresholds")
+def test_large_file_is_split(tmp_path: Path):
+    lines = _make_lines(0, 5_000)
+    source = _write_batch_file(tmp_path / "large.json.gz", lines)
+    output_dir = tmp_path / "out"
+    output_dir.mkdir()
+    assert _size(source) > batching.MAX_STAGE_FILE_SIZE
+
+    staged = batching.rechunk_batch_files([source], str(output_dir))
+
+    assert len(staged) > 1
+    assert all(Path(urlparse(uri).path).parent == output_dir for uri in staged)
+    assert [line for uri in staged for line in _read_lines(uri)] == lines
+
+
+@pytest.mark.usefixtures("small_thresholds")
+def test_small_files_are_merged_in_order(tmp_path: Path):
+    lines = [_make_lines(i, 3) for i in range(3)]
+    sources = [
+        _write_batch_file(tmp_path / f"small-{i}.json.gz", file_lines, trailing_newline=i != 1)
+        for i, file_lines in enumerate(lines)
+    ]
+    output_dir = tmp_path / "out"
+    output_dir.mkdir()
+
+    staged = batching.rechunk_batch_files(sources, str(output_dir))
+
+    assert len(staged) == 1
+    assert staged[0] not in sources
+    assert _read_lines(staged[0]) == [line for file_lines in lines for line in file_lines]
+
+
+@pytest.mark.usefixtures("small_thresholds")
+def test_mid_size_file_is_kept(tmp_path: Path):
+    mid_size = None
+    for count in range(100, 5_000, 100):
+        source = _write_batch_file(tmp_path / "mid.json.gz", _make_lines(0, count))
+        if batching.MIN_STAGE_FILE_SIZE <= _size(source) <= batching.MAX_STAGE_FILE_SIZE:
+            mid_size = source
+            break
+    assert mid_size is not None
+    small = _write_batch_file(tmp_path / "small.json.gz", _make_lines(1, 1))
+    output_dir = tmp_path / "out"
+    output_dir.mkdir()
+
+    staged = batching.rechunk_batch_files([mid_size, small], str(output_dir))
+
+    # A lone small file has nothing to merge with and is staged as is.
+    assert staged == [mid_size, small]
+    assert not list(output_dir.iterdir())
+
+
+@pytest.mark.usefixtures("small_thresholds")
+def test_mixed_files_preserve_every_line(tmp_path: Path):
+    counts = [3, 3, 3, 5_000, 1_000, 2]
+    lines = [_make_lines(i, count) for i, count in enumerate(counts)]
+    sources = [_write_batch_file(tmp_path / f"batch-{i}.json.gz", file_lines) for i, file_lines in enumerate(lines)]
+    output_dir = tmp_path / "out"
+    output_dir.mkdir()
+
+    staged = batching.rechunk_batch_files(sources, str(output_dir))
+
+    staged_lines = sorted(line for uri in staged for line in _read_lines(uri))
+    assert staged_lines == sorted(line for file_lines in lines for line in file_lines)
+
+
+@pytest.mark.usefixtures("small_thresholds")
+def test_split_shards_rotate_at_target_size(tmp_path: Path):
+    lines = _make_lines(0, 5_000)
+    source = _write_batch_file(tmp_path / "large.json.gz", lines)
+    output_dir = tmp_path / "out"
+    output_dir.mkdir()
+
+    staged = batching.rechunk_batch_files([source], str(output_dir))
+
+    assert len(staged) > 1
+    assert [uri.rsplit("/", 1)[-1] for uri in staged] == [f"split-1-{i}.json.gz" for i in range(1, len(staged) + 1)]
+    # Every shard but the last is rotated once it reaches the target size.
+    assert all(_size(uri) < batching.MAX_STAGE_FILE_SIZE for uri in staged)
+    assert all(_size(uri) >= batching.TARGET_STAGE_FILE_SIZE for uri in staged[:-1])
+    assert [line for uri in staged for line in _read_lines(uri)] == lines
+
+
+@pytest.mark.parametrize(
+    "record",
+    [
+        pytest.param({"value": decimal.Decimal("1.10")}, id="decimal"),
+        pytest.param({"value": decimal.Decimal("-1E+30")}, id="decimal-exponent"),
+        pytest.param({"value": 2**70}, id="wide-integer"),
+        pytest.param({"value": 1.5, "missing": None}, id="float"),
+        pytest.param(
+            {"value": dt.datetime(2024, 1, 2, 3, 4, 5, 6, tzinfo=dt.timezone.utc)},
+            id="datetime",
+        ),
+        # The SDK writes naive datetimes without an offset; the batcher has to match.
+        pytest.param({"value": dt.datetime(2024, 1, 2, 3, 4, 5)}, id="naive-datetime"),  # noqa: DTZ001
+        pytest.param({"value": dt.date(2024, 1, 2)}, id="date"),
+        pytest.param({"value": uuid.UUID(int=1)}, id="uuid"),
+        pytest.param({"value": "caf\u00e9 \u2603"}, id="unicode"),
+        pytest.param(
+            {"value": {"items": [decimal.Decimal("0.1"), None, {"at": dt.date(2024, 1, 2)}]}},
+            id="nested",
+        ),
+    ],
+)
+def test_serialize_record_matches_sdk(record: dict):
+    line = batching.serialize_record(record)
+
+    assert line.endswith(b"\n")
+    assert json.loads(line, parse_float=decimal.Decimal) == json.loads(
+        serialize_json(record),
+        parse_float=decimal.Decimal,
+    )
+
+
+def test_batch_files_round_trip_through_stdlib_gzip(tmp_path: Path):
+    pytest.importorskip("isal")
+    assert batching.gzip.__name__ == "isal.igzip"
+    lines = [_make_lines(i, 50) for i in range(2)]
+    sources = [_write_batch_file(tmp_path / f"small-{i}.json.gz", file_lines) for i, file_lines in enumerate(lines)]
+    output_dir = tmp_path / "out"
+    output_dir.mkdir()
+
+    # Merging small files rewrites them with the module's gzip implementation.
+    [merged] = batching.rechunk_batch_files(sources, str(output_dir))
+
+    assert merged not in sources
+    with gzip.open(urlparse(merged).path, "rb") as f:
+        assert f.read().splitlines() == [line for file_lines in lines for line in file_lines]
+
+
+def test_serialize_record_uses_orjson(monkeypatch: pytest.MonkeyPatch):
+    def fail(_: object) -> str:
+        msg = "the SDK serializer should not be needed"
+        raise AssertionError(msg)
+
+    monkeypatch.setattr(batching, "serialize_json", fail)
+
+    assert batching.serialize_record({"value": decimal.Decimal("1.10"), "missing": None}) == (
+        b'{"value":1.10,"missing":null}\n'
+    )
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        decimal.Decimal("NaN"),
+        decimal.Decimal("Infinity"),
+        decimal.Decimal("-Infinity"),
+        float("nan"),
+        float("inf"),
+        [float("-inf")],
+        {"nested": decimal.Decimal("NaN")},
+    ],
+    ids=repr,
+)
+def test_serialize_record_non_finite_matches_sdk(value):
+    record = {"value": value}
+    with pytest.raises(ValueError, match="Out of range float values") as sdk_error:
+        serialize_json(record)
+
+    with pytest.raises(type(sdk_error.value)):
+        batching.serialize_record(record)
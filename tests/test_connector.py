@@ -0,0 +1,463 @@
+"""Tests for the Snowflake connector that do not need a live account."""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import typing as t
+
+import pytest
+import sqlalchemy
+from snowflake.sqlalchemy import NUMBER, TIMESTAMP_NTZ
+
+from target_snowflake.connector import _SHOW_MAX_ROWS, SnowflakeConnector, SnowflakeFullyQualifiedName
+
+SCHEMA = {
+    "properties": {
+        "id": {"type": ["integer"]},
+        "name": {"type": ["string", "null"]},
+    },
+}
+
+
+class FakeCursor:
+    """Cursor returning a fixed row count for each statement of a request."""
+
+    def __init__(self, rowcounts: list[int]) -> None:
+        self.executed: list[tuple[str, dict]] = []
+        self._rowcounts = rowcounts
+        self.rowcount = -1
+
+    def execute(self, sql: str, params: dict | None = None, **kwargs) -> FakeCursor:
+        assert params is None
+        self.executed.append((sql, kwargs))
+        self._results = iter(self._rowcounts)
+        self.rowcount = next(self._results)
+        return self
+
+    def nextset(self) -> FakeCursor | None:
+        self.rowcount = next(self._results, -1)
+        return self if self.rowcount != -1 else None
+
+    def close(self) -> None:
+        pass
+
+
+class FakeResult:
+    def __init__(self, rows: list[tuple]) -> None:
+        self._rows = rows
+
+    def fetchall(self) -> list[tuple]:
+        return self._rows
+
+
+class FakeConnection:
+    def __init__(self, cursor: FakeCursor, respond: t.Callable[[str], list[tuple]] | None = None) -> None:
+        self.connection = self
+        self._cursor = cursor
+        self._respond = respond
+        self.executed: list[tuple[str, dict | None]] = []
+
+    def cursor(self) -> FakeCursor:
+        return self._cursor
+
+    def execute(self, statement: t.Any, params: dict | None = None) -> FakeResult:
+        sql = str(statement)
+        self.executed.append((sql, params))
+        return FakeResult(self._respond(sql) if self._respond else [])
+
+    def begin(self) -> contextlib.AbstractContextManager:
+        return contextlib.nullcontext()
+
+
+BASE_CONFIG = {"account": "account", "user": "user", "password": "password", "database": "DB"}
+
+
+@pytest.fixture
+def connector_config() -> dict:
+    return BASE_CONFIG
+
+
+@pytest.fixture
+def connector(connector_config: dict) -> SnowflakeConnector:
+    return SnowflakeConnector(connector_config)
+
+
+@pytest.mark.parametrize(
+    ("setting", "expected"),
+    [({}, 4), ({"put_max_concurrency": None}, 4), ({"put_max_concurrency": 1}, 1)],
+)
+def test_put_max_concurrency(setting: dict, expected: int):
+    connector = SnowflakeConnector({"account": "account", "user": "user", "database": "DB", **setting})
+    assert connector.put_max_concurrency == expected
+
+
+@pytest.fixture
+def cursor(connector: SnowflakeConnector, monkeypatch: pytest.MonkeyPatch) -> FakeCursor:
+    # Result sets: file format, load, then REMOVE when merging.
+    fake_cursor = FakeCursor([1, 7, 2])
+
+    @contextlib.contextmanager
+    def connect():
+        yield FakeConnection(fake_cursor)
+
+    monkeypatch.setattr(connector, "_connect", connect)
+    return fake_cursor
+
+
+def _statements(sql: str) -> list[list[str]]:
+    return [statement.strip().split(maxsplit=2)[:2] for statement in sql.split(";\n")]
+
+
+def test_load_from_stage_merge(connector: SnowflakeConnector, cursor: FakeCursor):
+    rowcount = connector.load_from_stage(
+        full_table_name="DB.SCHEMA.TABLE",
+        schema=SCHEMA,
+        sync_id="sync-1",
+        file_format="DB.SCHEMA.FF",
+        key_properties=["id"],
+    )
+
+    assert rowcount == 7
+    [(sql, kwargs)] = cursor.executed
+    assert _statements(sql) == [["create", "file"], ["merge", "into"], ["remove", "'@~/target-snowflake/sync-1/'"]]
+    assert kwargs == {"num_statements": 3}
+
+
+def test_load_from_stage_copy_reuses_file_format(connector: SnowflakeConnector, cursor: FakeCursor):
+    connector.file_format_cache.add("DB.SCHEMA.FF")
+
+    rowcount = connector.load_from_stage(
+        full_table_name="DB.SCHEMA.TABLE",
+        schema=SCHEMA,
+        sync_id="sync-1",
+        file_format="DB.SCHEMA.FF",
+    )
+
+    # The first result set is the load when the file format already exists.
+    assert rowcount == 1
+    [(sql, kwargs)] = cursor.executed
+    assert _statements(sql) == [["copy", "into"]]
+    assert kwargs == {"num_statements": 1}
+
+
+@pytest.mark.parametrize("connector_config", [{**BASE_CONFIG, "copy_match_by_column_name": True}])
+def test_load_from_stage_copy_match_by_column_name(connector: SnowflakeConnector, cursor: FakeCursor):
+    connector.file_format_cache.add("DB.SCHEMA.FF")
+
+    connector.load_from_stage(
+        full_table_name="DB.SCHEMA.TABLE",
+        schema=SCHEMA,
+        sync_id="sync-1",
+        file_format="DB.SCHEMA.FF",
+    )
+
+    # Snowflake maps the JSON keys itself, so there is no select list to cast columns.
+    [(sql, _)] = cursor.executed
+    assert sql == (
+        "copy into DB.SCHEMA.TABLE from '@~/target-snowflake/sync-1' "
+        "file_format = (format_name='DB.SCHEMA.FF') "
+        "match_by_column_name = case_insensitive purge = true"
+    )
+
+
+def test_granular_stage_methods_match_load_from_stage(connector: SnowflakeConnector, cursor: FakeCursor):
+    load_kwargs = {
+        "full_table_name": "DB.SCHEMA.TABLE",
+        "schema": SCHEMA,
+        "sync_id": "sync-1",
+        "file_format": "DB.SCHEMA.FF",
+    }
+    connector.create_file_format("DB.SCHEMA.FF")
+    connector.merge_from_stage(**load_kwargs, key_properties=["id"])
+    connector.copy_from_stage(**load_kwargs)
+    connector.remove_staged_files("sync-1")
+    connector.load_from_stage(**load_kwargs, key_properties=["id"])
+    connector.load_from_stage(**load_kwargs)
+
+    *granular, (merge_request, _), (copy_request, _) = cursor.executed
+    assert all(kwargs == {} for _, kwargs in granular)
+    # The file format was created first, so neither load request creates it again.
+    assert merge_request == ";\n".join(sql for sql, _ in (granular[1], granular[3]))
+    assert copy_request == granular[2][0]
+
+
+def test_stage_location_escapes_stream_name(connector: SnowflakeConnector, cursor: FakeCursor):
+    sync_id = "tap--o'brien\\x-1"
+    # The quote and backslash are escaped inside the string literal.
+    stage = "'@~/target-snowflake/tap--o\\'brien\\\\x-1"
+
+    put_sql, _ = connector._get_put_statement(sync_id, "file:///tmp/batch.json.gz")
+    connector.copy_from_stage("DB.SCHEMA.T", SCHEMA, sync_id, "FF")
+    connector.remove_staged_files(sync_id)
+
+    [(copy_sql, _), (remove_sql, _)] = cursor.executed
+    assert put_sql.startswith(f"put %(file_uri)s {stage}' parallel = ")
+    assert f"from {stage}')file_format = (format_name='FF')" in copy_sql
+    assert remove_sql == f"remove {stage}/'"
+
+
+def _show_column(table: str, column: str, data_type: dict) -> tuple:
+    return (table, "SCHEMA", column, json.dumps(data_type), "true")
+
+
+class FakeCatalog:
+    """Answer metadata queries for a schema holding a single table, T."""
+
+    def __init__(self) -> None:
+        self.columns = [_show_column("T", "ID", {"type": "FIXED", "precision": 38, "scale": 0})]
+        self.statements: list[str] = []
+        self.cursor = FakeCursor([0])
+
+    def __call__(self, sql: str) -> list[tuple]:
+        self.statements.append(sql)
+        if sql.startswith("show columns"):
+            return self.columns
+        if sql.startswith("desc table"):
+            if "MISSING" in sql.upper():
+                msg = "does not exist"
+                raise sqlalchemy.exc.ProgrammingError(sql, {}, Exception(msg))
+            return [("ID", "NUMBER(38,0)", "COLUMN", "Y"), ("NAME", "VARCHAR(10)", "COLUMN", "Y")]
+        if sql.startswith("ALTER TABLE"):
+            self.columns = [*self.columns, _show_column("T", "NAME", {"type": "TEXT", "length": 10})]
+        return []
+
+
+@pytest.fixture
+def catalog(connector: SnowflakeConnector, monkeypatch: pytest.MonkeyPatch) -> FakeCatalog:
+    fake_catalog = FakeCatalog()
+
+    @contextlib.contextmanager
+    def connect():
+        yield FakeConnection(fake_catalog.cursor, fake_catalog)
+
+    monkeypatch.setattr(connector, "_connect", connect)
+    return fake_catalog
+
+
+@pytest.mark.parametrize(
+    "full_table_name",
+    [
+        "db.schema.t",
+        "DB.SCHEMA.T",
+        '"DB"."SCHEMA"."T"',
+        '"db"."schema"."t"',
+        SnowflakeFullyQualifiedName(database="db", schema="schema", table="t"),
+        SnowflakeFullyQualifiedName(database="DB", schema="SCHEMA", table="T"),
+    ],
+    ids=str,
+)
+def test_table_cache_key_follows_session_identifier_case(connector: SnowflakeConnector, full_table_name):
+    # The session sets QUOTED_IDENTIFIERS_IGNORE_CASE, so quoting does not change the table.
+    assert connector._get_table_cache_key(full_table_name) == ("DB", "SCHEMA", "T")
+
+
+def test_table_cache_key_unescapes_quoted_parts(connector: SnowflakeConnector):
+    assert connector._get_table_cache_key('DB.SCHEMA."say ""hi"""') == ("DB", "SCHEMA", 'SAY "HI"')
+
+
+def test_get_table_columns_caches_missing_table(connector: SnowflakeConnector, catalog: FakeCatalog):
+    for _ in range(2):
+        with pytest.raises(sqlalchemy.exc.NoSuchTableError):
+            connector.get_table_columns("DB.SCHEMA.MISSING")
+
+    assert connector.table_cache[("DB", "SCHEMA", "MISSING")] is None
+    assert not connector.table_exists("db.schema.missing")
+    assert [sql.split()[0] for sql in catalog.statements] == ["show", "desc"]
+
+
+def test_get_table_columns_does_not_cache_filtered_columns(connector: SnowflakeConnector, catalog: FakeCatalog):
+    # OTHER is described on its own, T comes from the schema-wide listing.
+    assert list(connector.get_table_columns("DB.SCHEMA.OTHER", column_names=["NAME"])) == ["name"]
+    assert list(connector.get_table_columns("DB.SCHEMA.OTHER")) == ["id", "name"]
+    assert list(connector.get_table_columns("DB.SCHEMA.T", column_names=["name"])) == []
+    assert list(connector.get_table_columns("DB.SCHEMA.T", column_names=["ID"])) == ["id"]
+    assert [sql.split()[0] for sql in catalog.statements] == ["show", "desc"]
+
+
+def test_alter_table_invalidates_table_cache(connector: SnowflakeConnector, catalog: FakeCatalog):
+    assert list(connector.get_table_columns("DB.SCHEMA.T")) == ["id"]
+
+    connector._apply_column_changes(
+        "DB.SCHEMA.T",
+        [sqlalchemy.Column("NAME", sqlalchemy.types.VARCHAR(10))],
+        [],
+    )
+
+    assert ("DB", "SCHEMA", "T") not in connector.table_cache
+    assert list(connector.get_table_columns("db.schema.t")) == ["id", "name"]
+    assert [sql.split()[0] for sql in catalog.statements] == ["show", "ALTER", "desc"]
+
+
+def test_copy_and_merge_share_column_selections(connector: SnowflakeConnector, monkeypatch: pytest.MonkeyPatch):
+    calls = []
+    get_column_selections = connector._get_column_selections
+
+    def spy(*args, **kwargs):
+        calls.append(args)
+        return get_column_selections(*args, **kwargs)
+
+    monkeypatch.setattr(connector, "_get_column_selections", spy)
+    statement_kwargs = {"full_table_name": "DB.SCHEMA.T", "schema": SCHEMA, "sync_id": "s", "file_format": "FF"}
+
+    connector._get_copy_statement(**statement_kwargs)
+    connector._get_merge_from_stage_statement(**statement_kwargs, key_properties=["id"])
+    connector._get_merge_from_stage_statement(**statement_kwargs, key_properties=["name"])
+
+    assert len(calls) == 1
+
+
+def test_dedup_in_merge_is_kept_per_connector():
+    statement_kwargs = {"full_table_name": "DB.SCHEMA.T", "schema": SCHEMA, "sync_id": "s", "file_format": "FF"}
+    dedup = SnowflakeConnector(BASE_CONFIG)
+    no_dedup = SnowflakeConnector({**BASE_CONFIG, "dedup_in_merge": False})
+
+    # Warm both caches with the same key before rendering the other connector's statement.
+    dedup_sql = str(dedup._get_merge_from_stage_statement(**statement_kwargs, key_properties=["id"])[0])
+    no_dedup_sql = str(no_dedup._get_merge_from_stage_statement(**statement_kwargs, key_properties=["id"])[0])
+
+    qualify = "QUALIFY ROW_NUMBER() OVER (PARTITION BY id ORDER BY SEQ8() DESC) = 1"
+    assert qualify in dedup_sql
+    assert "QUALIFY" not in no_dedup_sql
+    assert dedup_sql.replace(qualify, "") == no_dedup_sql
+    # The caches share keys, so each connector must keep its own.
+    assert dedup.merge_clause_cache.keys() == no_dedup.merge_clause_cache.keys()
+    assert str(dedup._get_merge_from_stage_statement(**statement_kwargs, key_properties=["id"])[0]) == dedup_sql
+
+
+def test_collation_does_not_leak_into_cached_types(connector: SnowflakeConnector, catalog: FakeCatalog):
+    jsonschema_type = {"type": ["string", "null"], "maxLength": 100}
+    collated_type = sqlalchemy.types.VARCHAR(50, collation="en-ci")
+    connector.table_cache[("DB", "SCHEMA", "T")] = {"name": sqlalchemy.Column("name", collated_type)}
+
+    connector.prepare_column("DB.SCHEMA.T", "name", connector.to_sql_type(jsonschema_type))
+
+    [alter] = [sql for sql in catalog.statements if sql.startswith("ALTER TABLE")]
+    assert alter.endswith('SET DATA TYPE VARCHAR(100) COLLATE "en-ci"')
+    assert collated_type.collation == "en-ci"
+    assert connector.to_sql_type(jsonschema_type).collation is None
+
+
+@pytest.mark.parametrize("connector_config", [{**BASE_CONFIG, "compact_copy_sql": True}])
+def test_compact_copy_sql_requires_matching_table_columns(connector: SnowflakeConnector, catalog: FakeCatalog):
+    copy_kwargs = {"schema": SCHEMA, "sync_id": "sync-1", "file_format": "FF"}
+    # T has only ID, as if NAME had been added to the stream after the table was created.
+    connector.copy_from_stage(full_table_name="DB.SCHEMA.T", **copy_kwargs)
+    # Described again, T now has ID and NAME.
+    connector.table_cache.clear()
+    connector.copy_from_stage(full_table_name="DB.SCHEMA.T", **copy_kwargs)
+    # NAME was added at the end, so a stream that lists it first needs the column list.
+    reordered = {"properties": dict(reversed(SCHEMA["properties"].items()))}
+    connector.copy_from_stage(full_table_name="DB.SCHEMA.T", **{**copy_kwargs, "schema": reordered})
+
+    [(fallback, _), (compact, _), (reordered_fallback, _)] = catalog.cursor.executed
+    assert fallback.startswith("copy into DB.SCHEMA.T (id, name) from (select $1:id::")
+    assert compact.startswith("copy into DB.SCHEMA.T  from (select $1:id::")
+    assert reordered_fallback.startswith("copy into DB.SCHEMA.T (name, id) from (select $1:name::")
+
+
+# (column, SHOW COLUMNS data type, information_schema data type, precision, scale, length)
+TYPED_COLUMNS = [
+    ("ID", {"type": "FIXED", "precision": 38, "scale": 0, "nullable": False}, "NUMBER", 38, 0, None),
+    ("AMOUNT", {"type": "FIXED", "precision": 10, "scale": 2, "nullable": True}, "NUMBER", 10, 2, None),
+    ("NAME", {"type": "TEXT", "length": 10, "nullable": True}, "TEXT", None, None, 10),
+    ("RATIO", {"type": "REAL", "nullable": True}, "FLOAT", None, None, None),
+    ("PAYLOAD", {"type": "BINARY", "length": 8, "nullable": True}, "BINARY", None, None, 8),
+    ("SEEN_AT", {"type": "TIMESTAMP_NTZ", "precision": 0, "scale": 9, "nullable": True}, "TIMESTAMP_NTZ", 0, 9, None),
+    ("ACTIVE", {"type": "BOOLEAN", "nullable": True}, "BOOLEAN", None, None, None),
+    ("DATA", {"type": "VARIANT", "nullable": True}, "VARIANT", None, None, None),
+]
+
+
+def _describe_preloaded_columns(connector: SnowflakeConnector, monkeypatch: pytest.MonkeyPatch, filler: int) -> tuple:
+    show_rows = [("T", "SCHEMA", column, json.dumps(show_type), "true") for column, show_type, *_ in TYPED_COLUMNS]
+    show_rows += [("FILLER", "SCHEMA", f"C{i}", '{"type": "TEXT", "length": 1}', "true") for i in range(filler)]
+    information_schema_rows = [
+        ("T", column, data_type, "NO" if column == "ID" else "YES", precision, scale, length)
+        for column, _, data_type, precision, scale, length in TYPED_COLUMNS
+    ]
+    information_schema_rows += [("FILLER", f"C{i}", "TEXT", "YES", None, None, 1) for i in range(filler)]
+    connection = FakeConnection(
+        FakeCursor([]),
+        lambda sql: show_rows if sql.startswith("show columns") else information_schema_rows,
+    )
+
+    @contextlib.contextmanager
+    def connect():
+        yield connection
+
+    monkeypatch.setattr(connector, "_connect", connect)
+    columns = connector.get_table_columns("DB.SCHEMA.T")
+    return [(sql.split()[0], params) for sql, params in connection.executed], [
+        (
+            name,
+            type(column.type).__name__,
+            *(getattr(column.type, attribute, None) for attribute in ("precision", "scale", "length")),
+            column.nullable,
+        )
+        for name, column in columns.items()
+    ]
+
+
+def test_preload_falls_back_to_information_schema(monkeypatch: pytest.MonkeyPatch):
+    show_statements, show_columns = _describe_preloaded_columns(SnowflakeConnector(BASE_CONFIG), monkeypatch, 0)
+    fallback_statements, fallback_columns = _describe_preloaded_columns(
+        SnowflakeConnector(BASE_CONFIG),
+        monkeypatch,
+        _SHOW_MAX_ROWS - len(TYPED_COLUMNS),
+    )
+
+    assert show_statements == [("show", None)]
+    # The schema filter is bound rather than formatted into the query.
+    assert fallback_statements == [("show", None), ("select", {"database": "DB", "schema_name": "SCHEMA"})]
+    assert fallback_columns == show_columns
+    assert [name for name, *_ in show_columns] == [column.lower() for column, *_ in TYPED_COLUMNS]
+
+
+def test_column_changes_are_batched_from_the_ddl_hooks(connector: SnowflakeConnector, catalog: FakeCatalog):
+    connector._apply_column_changes(
+        "DB.SCHEMA.T",
+        [sqlalchemy.Column("a", sqlalchemy.types.VARCHAR(10)), sqlalchemy.Column("b", NUMBER(38, 0))],
+        [("c", sqlalchemy.types.VARCHAR(20)), ("d", NUMBER(38, 2))],
+    )
+
+    assert catalog.statements == [
+        "ALTER TABLE DB.SCHEMA.T ADD COLUMN a VARCHAR(10), b DECIMAL(38, 0)",
+        "ALTER TABLE DB.SCHEMA.T ALTER COLUMN c SET DATA TYPE VARCHAR(20), COLUMN d SET DATA TYPE DECIMAL(38, 2)",
+    ]
+    # A single column change renders the same clause through the SDK hooks.
+    assert str(connector.get_column_add_ddl("DB.SCHEMA.T", "a", sqlalchemy.types.VARCHAR(10))) == (
+        "ALTER TABLE DB.SCHEMA.T ADD COLUMN a VARCHAR(10)"
+    )
+    assert str(connector.get_column_alter_ddl("DB.SCHEMA.T", "c", sqlalchemy.types.VARCHAR(20))) == (
+        "ALTER TABLE DB.SCHEMA.T ALTER COLUMN c SET DATA TYPE VARCHAR(20)"
+    )
+
+
+@pytest.mark.parametrize(
+    ("first", "second", "expected"),
+    [
+        pytest.param(sqlalchemy.types.VARCHAR(10), sqlalchemy.types.VARCHAR(10), True, id="varchar"),
+        pytest.param(sqlalchemy.types.VARCHAR(10), sqlalchemy.types.VARCHAR(20), False, id="varchar-length"),
+        pytest.param(sqlalchemy.types.VARCHAR(10), sqlalchemy.types.VARCHAR(), False, id="varchar-unbounded"),
+        pytest.param(
+            sqlalchemy.types.VARCHAR(10, collation="en-ci"),
+            sqlalchemy.types.VARCHAR(10),
+            False,
+            id="varchar-collation",
+        ),
+        pytest.param(NUMBER(38, 0), NUMBER(38, 0), True, id="number"),
+        pytest.param(NUMBER(38, 0), NUMBER(10, 0), False, id="number-precision"),
+        pytest.param(NUMBER(38, 0), NUMBER(38, 2), False, id="number-scale"),
+        # Reflected types are generic SQLAlchemy classes, declared ones come from the dialect.
+        pytest.param(sqlalchemy.types.DECIMAL(38, 0), NUMBER(38, 0), True, id="reflected-number"),
+        pytest.param(sqlalchemy.types.String(10), sqlalchemy.types.VARCHAR(10), True, id="reflected-varchar"),
+        pytest.param(sqlalchemy.types.TEXT(), sqlalchemy.types.VARCHAR(), False, id="text-varchar"),
+        pytest.param(sqlalchemy.types.DateTime(), TIMESTAMP_NTZ(), False, id="datetime-timestamp-ntz"),
+    ],
+)
+def test_type_equal_matches_rendered_types(first, second, *, expected: bool):
+    assert SnowflakeConnector._type_equal(first, second) is expected
+    assert SnowflakeConnector._type_equal(second, first) is expected
+    # The shortcut must agree with comparing the rendered types.
+    assert (str(first) == str(second)) is expected
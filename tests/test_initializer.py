@@ -0,0 +1,83 @@
+"""Tests for the interactive account initializer."""
+
+from __future__ import annotations
+
+import contextlib
+import typing as t
+
+import click
+
+from target_snowflake.connector import SnowflakeConnector
+from target_snowflake.initializer import initializer
+
+if t.TYPE_CHECKING:
+    import pytest
+
+
+class FakeCursor:
+    """Cursor returning a fixed number of result sets for each request."""
+
+    def __init__(self, result_sets: int) -> None:
+        self.executed: list[tuple[str, dict]] = []
+        self.result_sets = result_sets
+        self.remaining_sets = 0
+        self.closed = False
+
+    def execute(self, sql: str, **kwargs) -> FakeCursor:
+        self.executed.append((sql, kwargs))
+        self.remaining_sets = self.result_sets - 1
+        return self
+
+    def nextset(self) -> FakeCursor | None:
+        if not self.remaining_sets:
+            return None
+        self.remaining_sets -= 1
+        return self
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class FakeConnection:
+    def __init__(self, cursor: FakeCursor) -> None:
+        self.connection = self
+        self._cursor = cursor
+
+    def cursor(self) -> FakeCursor:
+        return self._cursor
+
+
+def test_initializer_runs_script_as_one_request(monkeypatch: pytest.MonkeyPatch):
+    password = "pa;ss;word"  # noqa: S105
+    answers = {
+        "Would you like to run in `dry_run` mode?": False,
+        "Meltano Password": password,
+        "Account (i.e. lqnwlrc-onb17812)": "account",
+        "User w/SYSADMIN access": "admin",
+        "User Password": "admin-password",
+    }
+    cursor = FakeCursor(result_sets=5)
+
+    @contextlib.contextmanager
+    def connect(_):
+        yield FakeConnection(cursor)
+
+    monkeypatch.setattr(click, "prompt", lambda text, **kwargs: answers.get(text, kwargs.get("default")))
+    monkeypatch.setattr(SnowflakeConnector, "_connect", connect)
+
+    initializer()
+
+    [(sql, kwargs)] = cursor.executed
+    assert sql == SnowflakeConnector.get_initialize_script(
+        "MELTANO_ROLE",
+        "MELTANO_USER",
+        password,
+        "MELTANO_WAREHOUSE",
+        "MELTANO_DATABASE",
+    )
+    # Snowflake counts the statements itself, so the semicolons in the password
+    # cannot throw off a client-side count.
+    assert kwargs == {"num_statements": 0}
+    # Every result set is read, so errors in later statements are raised.
+    assert cursor.remaining_sets == 0
+    assert cursor.closed
@@ -0,0 +1,55 @@
+"""Tests for the Snowflake sink that do not need a live account."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from urllib.parse import urlparse
+
+import pytest
+
+from target_snowflake.sinks import SnowflakeSink
+from target_snowflake.target import TargetSnowflake
+
+SCHEMA = {"properties": {"id": {"type": ["integer"]}}}
+
+
+@pytest.fixture
+def sink() -> SnowflakeSink:
+    target = TargetSnowflake(
+        config={
+            "account": "account",
+            "user": "user",
+            "password": "password",
+            "database": "DB",
+            "default_target_schema": "SCHEMA",
+            "clean_up_batch_files": True,
+        },
+    )
+    return SnowflakeSink(target, "users", SCHEMA, ["id"])
+
+
+@pytest.mark.parametrize("fail", [False, True], ids=["success", "error"])
+def test_bulk_insert_records_removes_batch_dir(sink: SnowflakeSink, monkeypatch: pytest.MonkeyPatch, *, fail: bool):
+    loaded: list[Path] = []
+
+    def insert_batch_files_via_internal_stage(files: list[str], **_) -> int:
+        paths = [Path(urlparse(file_url).path) for file_url in files]
+        assert all(path.exists() for path in paths)
+        loaded.extend(paths)
+        if fail:
+            msg = "load failed"
+            raise RuntimeError(msg)
+        return len(paths)
+
+    monkeypatch.setattr(sink, "insert_batch_files_via_internal_stage", insert_batch_files_via_internal_stage)
+    records = [{"id": i} for i in range(3)]
+
+    if fail:
+        with pytest.raises(RuntimeError, match="load failed"):
+            sink.bulk_insert_records(sink.full_table_name, SCHEMA, records)
+    else:
+        assert sink.bulk_insert_records(sink.full_table_name, SCHEMA, records) == 3
+
+    assert loaded
+    assert not any(path.exists() for path in loaded)
+    assert not any(path.parent.exists() for path in loaded)